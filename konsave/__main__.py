@@ -124,16 +124,17 @@ def main():
     parser = _get_parser()
     args = parser.parse_args()
 
+    # the profiles are only listed by the commands that need them
     if args.list:
-        list_profiles(list_of_profiles, length_of_lop)
+        list_profiles(list_of_profiles(), length_of_lop())
     elif args.save:
-        save_profile(args.save, list_of_profiles, force=args.force)
+        save_profile(args.save, list_of_profiles(), force=args.force)
     elif args.remove:
-        remove_profile(args.remove, list_of_profiles, length_of_lop)
+        remove_profile(args.remove, list_of_profiles(), length_of_lop())
     elif args.apply:
-        apply_profile(args.apply, list_of_profiles, length_of_lop)
+        apply_profile(args.apply, list_of_profiles(), length_of_lop())
     elif args.export_profile:
-        export(args.export_profile, list_of_profiles, length_of_lop,
+        export(args.export_profile, list_of_profiles(), length_of_lop(),
                args.export_directory, args.export_name, args.force)
     elif args.import_profile:
         import_profile(args.import_profile)
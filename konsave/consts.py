@@ -2,6 +2,7 @@
 This module contains all the variables for konsave
 """
 import os
+from functools import lru_cache
 from konsave import __version__
 
 
@@ -19,7 +20,28 @@ EXPORT_EXTENSION = ".knsv"
 if not os.path.exists(PROFILES_DIR):
     os.makedirs(PROFILES_DIR)
 
-list_of_profiles = os.listdir(PROFILES_DIR)
-length_of_lop = len(list_of_profiles)
-
 VERSION = __version__
+
+
+def list_of_profiles():
+    """Returns the names of all saved profiles. The directory is only scanned again
+    once its modification time changes, i.e. a profile was added or removed.
+    """
+    return list(_scan_profiles(os.stat(PROFILES_DIR).st_mtime_ns))
+
+
+def length_of_lop():
+    """Returns the number of saved profiles."""
+    return len(_scan_profiles(os.stat(PROFILES_DIR).st_mtime_ns))
+
+
+@lru_cache(maxsize=1)
+def _scan_profiles(mtime_ns):
+    """Lists PROFILES_DIR. Cached by list_of_profiles, don't call directly.
+
+    Args:
+        mtime_ns: modification time of PROFILES_DIR, part of the cache key
+    """
+    # pylint: disable=unused-argument
+    with os.scandir(PROFILES_DIR) as entries:
+        return tuple(sorted(entry.name for entry in entries if entry.is_dir()))
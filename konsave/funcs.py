@@ -4,19 +4,22 @@ This module contains all the functions for konsave.
 
 import os
 import re
+import secrets
 import shutil
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
+from functools import lru_cache
 from random import shuffle
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from types import MappingProxyType
 from typing import Dict, List
-from zipfile import ZipFile, is_zipfile
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo, is_zipfile
 
 from konsave.consts import (
     CONFIG_FILE,
     EXPORT_EXTENSION,
     HOME,
-    KONSAVE_DIR,
     PROFILES_DIR,
 )
 from konsave.parse import TOKEN_SYMBOL, parse_functions, parse_keywords, tokens
@@ -28,6 +31,30 @@ except ModuleNotFoundError as error:
         "Please install the module PyYAML using pip: \n" "pip install PyYAML"
     ) from error
 
+# use the libyaml bindings when PyYAML was built with them
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# matches the header line of a group in plasma config files
+_SECTION_HEADER = re.compile(rb"^\[.*\].*")
+
+# number of threads used to copy files
+_COPY_WORKERS = min(8, os.cpu_count() or 4)
+
+# files that don't get any smaller by deflating them again
+_COMPRESSED_SUFFIXES = frozenset(
+    {
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".webp",
+        ".woff2",
+        ".gz",
+        ".xz",
+        ".zst",
+        ".mp4",
+    }
+)
+
 
 def exception_handler(func):
     """Handles errors and prints nicely.
@@ -88,12 +115,8 @@ def log(msg, *args, **kwargs):
 
 @exception_handler
 def copy(source, dest):
-    """
-    This function was created because shutil.copytree gives error if the destination folder
-    exists and the argument "dirs_exist_ok" was introduced only after python 3.8.
-    This restricts people with python 3.7 or less from using Konsave.
-    This function will let people with python 3.7 or less use Konsave without any issues.
-    It uses recursion to copy files and folders from "source" to "dest"
+    """Recursively copies the folder "source" into "dest", merging it with whatever is
+    already in "dest" and overwriting existing files.
 
     Args:
         source: the source destination
@@ -103,31 +126,160 @@ def copy(source, dest):
     assert source != dest, "Source and destination can't be same"
     assert os.path.exists(source), "Source path doesn't exist"
 
-    if not os.path.exists(dest):
-        os.mkdir(dest)
+    _copytree(source, dest)
+
 
-    for item in os.listdir(source):
-        source_path = os.path.join(source, item)
-        dest_path = os.path.join(dest, item)
+def _copytree(source, dest):
+    """Recursive part of copy(). Walks "source" with os.scandir, so the type of every
+    entry comes from the directory listing instead of a separate stat call.
+    Symlinks are followed, dangling ones and special files are skipped. Existing
+    files in "dest" are removed before being replaced, so a symlink there is
+    replaced instead of written through.
+
+    Args:
+        source: the folder to copy
+        dest: the folder to copy it into, created if it doesn't exist
+    """
+    os.makedirs(dest, exist_ok=True)
+    dest_prefix = dest + os.sep
+    with os.scandir(source) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                _copytree(entry.path, dest_prefix + entry.name)
+            elif entry.is_file():
+                dest_path = dest_prefix + entry.name
+                # os.remove raises on a folder, so a folder in place of the file is
+                # reported instead of the file being copied into it
+                if os.path.lexists(dest_path):
+                    os.remove(dest_path)
+                shutil.copy(entry.path, dest_path)
+
+
+def _scan_entries(location, entries):
+    """Finds which of the given entries exist in a folder, scanning it only once.
 
-        if os.path.isdir(source_path):
-            copy(source_path, dest_path)
+    Args:
+        location: path to the folder containing the entries
+        entries: names of the files/folders to look for
+
+    Yields:
+        (entry, is_dir) for every entry that exists in location
+    """
+    try:
+        with os.scandir(location) as dir_entries:
+            found = {dir_entry.name: dir_entry for dir_entry in dir_entries}
+    except (FileNotFoundError, NotADirectoryError):
+        found = {}
+
+    for entry in entries:
+        dir_entry = found.get(entry)
+        if dir_entry is None or dir_entry.is_symlink():
+            # nested paths aren't in the scan and symlinks may be dangling, so stat them
+            source = os.path.join(location, entry)
+            if os.path.exists(source):
+                yield entry, os.path.isdir(source)
         else:
-            if os.path.exists(dest_path):
-                os.remove(dest_path)
-            if os.path.exists(source_path):
-                shutil.copy(source_path, dest)
+            yield entry, dir_entry.is_dir()
+
+
+def _copy_entries(copies):
+    """Copies files/folders concurrently. Copying is mostly waiting on the disk,
+    which doesn't hold the GIL, so threads are enough to overlap the copies.
+    Copies into the same or nested destinations still run one after the other in
+    the given order, so the later ones win like they did when copying serially.
+
+    Args:
+        copies: (source, dest, is_dir, strip_args) for every file/folder to copy,
+            strip_args are passed to strip_content right after copying, or None
+    """
+
+    def copy_entry(entry):
+        source, dest, is_dir, strip_args = entry
+        if is_dir:
+            copy(source, dest)
+        else:
+            shutil.copy(source, dest)
+
+        if strip_args is not None:
+            strip_content(dest, strip_args)
+
+    # start a new batch whenever a copy overlaps one already in the current batch
+    batches = []
+    batch_dests = []
+    for entry in copies:
+        dest = os.path.normpath(entry[1])
+        if not batches or any(_paths_overlap(dest, other) for other in batch_dests):
+            batches.append([])
+            batch_dests = []
+        batches[-1].append(entry)
+        batch_dests.append(dest)
+
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+        for batch in batches:
+            # consume the results so errors are raised here
+            list(executor.map(copy_entry, batch))
+
+
+def _paths_overlap(path, other):
+    """Checks if two normalized paths are the same or one is inside the other.
+
+    Args:
+        path: the first path
+        other: the second path
+    """
+    return (
+        path == other
+        or path.startswith(other + os.sep)
+        or other.startswith(path + os.sep)
+    )
 
 
 @exception_handler
 def read_konsave_config(config_file) -> dict:
     """Reads "conf.yaml" and parses it.
 
+    The loaded file is cached on its modification time and size, so reading the
+    same config again doesn't parse it again. The tokens are replaced in a new copy
+    on every call, which callers are free to modify.
+
     Args:
         config_file: path to the config file
     """
-    with open(config_file, "r") as text:
-        konsave_config = yaml.load(text.read(), Loader=yaml.SafeLoader)
+    stat = os.stat(config_file)
+    return _apply_tokens(
+        _parse_yaml_cached(os.path.abspath(config_file), stat.st_mtime_ns, stat.st_size)
+    )
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml_cached(config_file, mtime_ns, size):
+    """Loads "conf.yaml". Cached by read_konsave_config, don't call directly.
+
+    Args:
+        config_file: absolute path to the config file
+        mtime_ns: modification time of the file, part of the cache key
+        size: size of the file, part of the cache key
+
+    Returns:
+        the read-only loaded content
+    """
+    # pylint: disable=unused-argument
+    # let the loader read and decode the file itself instead of going through str
+    with open(config_file, "rb") as file:
+        return _freeze(yaml.load(file, Loader=_LOADER))
+
+
+def _apply_tokens(konsave_config) -> dict:
+    """Replaces keywords and functions in a loaded "conf.yaml".
+
+    Args:
+        konsave_config: the read-only loaded conf.yaml file
+
+    Returns:
+        a new config with the tokens replaced
+    """
+    assert konsave_config is not None, "The config file is empty"
+    konsave_config = _thaw(konsave_config)
     parse_keywords(tokens, TOKEN_SYMBOL, konsave_config)
     parse_functions(tokens, TOKEN_SYMBOL, konsave_config)
 
@@ -135,14 +287,43 @@ def read_konsave_config(config_file) -> dict:
     # yaml parses these as NoneType which are not iterable which throws an exception
     # we can convert all None-Entries into empty lists recursively so they are simply skipped in loops later on
     def convert_none_to_empty_list(data):
-        if isinstance(data, list):
-            data[:] = [convert_none_to_empty_list(i) for i in data]
-        elif isinstance(data, dict):
-            for k, v in data.items():
-                data[k] = convert_none_to_empty_list(v)
-        return [] if data is None else data
+        items = data.items() if isinstance(data, dict) else enumerate(data)
+        for k, v in items:
+            if v is None:
+                data[k] = []
+            elif isinstance(v, (dict, list)):
+                convert_none_to_empty_list(v)
+
+    if isinstance(konsave_config, (dict, list)):
+        convert_none_to_empty_list(konsave_config)
+    return konsave_config
+
+
+def _freeze(data):
+    """Returns a read-only copy of a loaded config, with dicts as mappingproxies and
+    lists as tuples.
+
+    Args:
+        data: the config or any value inside it
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(v) for v in data)
+    return data
 
-    return convert_none_to_empty_list(konsave_config)
+
+def _thaw(data):
+    """Returns a mutable copy of a config frozen with _freeze.
+
+    Args:
+        data: the frozen config or any value inside it
+    """
+    if isinstance(data, MappingProxyType):
+        return {k: _thaw(v) for k, v in data.items()}
+    if isinstance(data, tuple):
+        return [_thaw(v) for v in data]
+    return data
 
 
 @exception_handler
@@ -187,29 +368,29 @@ def save_profile(name, profile_list, force=False):
 
     konsave_config = read_konsave_config(CONFIG_FILE)["save"]
 
-    for section in konsave_config:
-        location = konsave_config[section]["location"]
-        strip = konsave_config[section].get("strip", {})
+    # collect everything to copy first so the copies can run concurrently
+    copies = []
+    for section, section_config in konsave_config.items():
+        location = section_config["location"]
+        # an empty "strip" is loaded as an empty list
+        strip = section_config.get("strip") or {}
         folder = os.path.join(profile_dir, section)
         mkdir(folder)
-        for entry in konsave_config[section]["entries"]:
-            source = os.path.join(location, entry)
-            dest = os.path.join(folder, entry)
-            if os.path.exists(source):
-                if os.path.isdir(source):
-                    copy(source, dest)
-                else:
-                    shutil.copy(source, dest)
+        # both prefixes are fixed for the section, so build paths by concatenation
+        location_prefix = location + os.sep
+        folder_prefix = folder + os.sep
+        for entry, is_dir in _scan_entries(location, section_config["entries"]):
+            dest = folder_prefix + entry
+            copies.append((location_prefix + entry, dest, is_dir, strip.get(entry)))
 
-                if entry in strip:
-                    strip_content(Path(dest), strip[entry])
+    _copy_entries(copies)
 
-    shutil.copy(CONFIG_FILE, profile_dir)
+    shutil.copyfile(CONFIG_FILE, os.path.join(profile_dir, "conf.yaml"))
 
     log("Profile saved successfully!")
 
 
-def strip_content(file_path: Path, strip_args: Dict[str, List[str]]) -> None:
+def strip_content(file_path: str, strip_args: Dict[str, List[str]]) -> None:
     """
     strip entire groups or individual keys from all groups in a file
     group names are in the plasma config format
@@ -219,47 +400,49 @@ def strip_content(file_path: Path, strip_args: Dict[str, List[str]]) -> None:
         file_path: path to the file
         strip_args: dict with keys "groups" and "keys"
     """
-    groups = strip_args.get("groups", [])
-    keys = strip_args.get("keys", [])
-    file_content = file_path.read_text().splitlines()
-    placeholder = "# stripped by konsave"
-
-    def strip_groups(file_content: List[str], groups: List[str]) -> List[str]:
-        for group in groups:
-            group_lines = [line for line in file_content if f"[{group}]" in line]
-            if group_lines:
-                for group_line in group_lines:
-                    group_idx = file_content.index(group_line)
-
-                    # remove group header line
-                    file_content[group_idx] = placeholder
-
-                    # remove lines from group_index until next section start
-                    for line in range(group_idx, len(file_content)):
-                        exp = re.compile(r"^\[.*\].*")
-                        if exp.match(file_content[line]):
-                            break
-                        file_content[line] = placeholder
-
-        return file_content
-
-    def strip_keys(file_content: List[str], keys: List[str]) -> List[str]:
-        for key in keys:
-            key_lines = [line for line in file_content if f"{key}=" in line]
-            if key_lines:
-                for key_line in key_lines:
-                    key_idx = file_content.index(key_line)
-                    file_content[key_idx] = placeholder
+    # the file is filtered as bytes, which skips decoding and newline translation
+    groups = [group.encode() for group in strip_args.get("groups", [])]
+    keys = frozenset(key.encode() for key in strip_args.get("keys", []))
+    # one alternation of all the "[group]" names, nested groups such as
+    # [Containments][1][group] match as well
+    stripped_group = (
+        re.compile(rb"\[(?:" + b"|".join(map(re.escape, groups)) + rb")\]")
+        if groups
+        else None
+    )
+    in_stripped_group = False
+
+    # stream the file line by line into a temporary file next to it, which then
+    # replaces the original, instead of holding the whole file in memory
+    folder, name = os.path.split(file_path)
+    with open(file_path, "rb") as file, NamedTemporaryFile(
+        "wb", dir=folder, prefix=f".{name}.", delete=False
+    ) as stripped:
+        try:
+            # single pass, tracking which group the current line belongs to
+            for line in file:
+                if _SECTION_HEADER.match(line):
+                    in_stripped_group = bool(
+                        stripped_group and stripped_group.search(line)
+                    )
+                    if not in_stripped_group:
+                        stripped.write(line)
+                    continue
 
-        return file_content
+                if in_stripped_group:
+                    continue
 
-    file_content = strip_groups(file_content, groups)
-    file_content = strip_keys(file_content, keys)
+                key, separator, _ = line.partition(b"=")
+                if separator and key.strip() in keys:
+                    continue
 
-    # remove empty lines
-    file_content = list(filter(lambda x: x != placeholder, file_content))
+                stripped.write(line)
+        except BaseException:
+            os.remove(stripped.name)
+            raise
 
-    file_path.write_text("\n".join(file_content))
+    shutil.copymode(file_path, stripped.name)
+    os.replace(stripped.name, file_path)
 
 
 @exception_handler
@@ -283,9 +466,12 @@ def apply_profile(profile_name, profile_list, profile_count):
 
     config_location = os.path.join(profile_dir, "conf.yaml")
     profile_config = read_konsave_config(config_location)["save"]
-    for name in profile_config:
-        location = os.path.join(profile_dir, name)
-        copy(location, profile_config[name]["location"])
+    _copy_entries(
+        [
+            (os.path.join(profile_dir, name), section_config["location"], True, None)
+            for name, section_config in profile_config.items()
+        ]
+    )
 
     log(
         "Profile applied successfully! Please log-out and log-in to see the changes completely!"
@@ -341,16 +527,13 @@ def export(profile_name, profile_list, profile_count, archive_dir, archive_name,
     else:
         export_path = os.path.join(os.getcwd(), profile_name)
 
-    # Only continue if export_path, export_path.ksnv and export_path.zip don't exist
-    # Appends date and time to create a unique file name
+    # Only continue if export_path.knsv doesn't exist, it's the only file export creates
+    # Appends date and time, and then a random suffix, to create a unique file name
     if not force:
-        while True:
-            paths = [f"{export_path}", f"{export_path}.knsv", f"{export_path}.zip"]
-            if any([os.path.exists(path) for path in paths]):
-                time = "f{:%d-%m-%Y:%H-%M-%S}".format(datetime.now())
-                export_path = f"{export_path}_{time}"
-            else:
-                break
+        if os.path.exists(export_path + EXPORT_EXTENSION):
+            export_path = f"{export_path}_{datetime.now():%d-%m-%Y_%H-%M-%S}"
+            if os.path.exists(export_path + EXPORT_EXTENSION):
+                export_path = f"{export_path}_{secrets.token_hex(3)}"
 
     # compressing the files as zip
     log("Exporting profile. It might take a minute or two...")
@@ -358,36 +541,89 @@ def export(profile_name, profile_list, profile_count, archive_dir, archive_name,
     profile_config_file = os.path.join(profile_dir, "conf.yaml")
     konsave_config = read_konsave_config(profile_config_file)
 
-    export_path_save = mkdir(os.path.join(export_path, "save"))
-    for name in konsave_config["save"]:
-        location = os.path.join(profile_dir, name)
-        log(f'Exporting "{name}"...')
-        copy(location, os.path.join(export_path_save, name))
-
-    konsave_config_export = konsave_config["export"]
-    export_path_export = mkdir(os.path.join(export_path, "export"))
-    for name in konsave_config_export:
-        location = konsave_config_export[name]["location"]
-        path = mkdir(os.path.join(export_path_export, name))
-        for entry in konsave_config_export[name]["entries"]:
-            source = os.path.join(location, entry)
-            dest = os.path.join(path, entry)
-            log(f'Exporting "{entry}"...')
-            if os.path.exists(source):
-                if os.path.isdir(source):
-                    copy(source, dest)
-                else:
-                    shutil.copy(source, dest)
+    # files are added to the archive straight from where they are, without
+    # copying them to a temporary folder first. The fastest deflate level is used,
+    # higher levels cost a lot more time for little gain on config files
+    mkdir(os.path.dirname(export_path))
+    with ZipFile(
+        export_path + EXPORT_EXTENSION,
+        "w",
+        ZIP_DEFLATED,
+        allowZip64=True,
+        compresslevel=1,
+    ) as zip_file:
+        zip_file.write(CONFIG_FILE, "conf.yaml")
+
+        add_folder_entry(zip_file, "save")
+        for name in konsave_config["save"]:
+            location = os.path.join(profile_dir, name)
+            log(f'Exporting "{name}"...')
+            if os.path.isdir(location):
+                add_to_archive(zip_file, location, f"save/{name}")
+
+        add_folder_entry(zip_file, "export")
+        for name, section_config in konsave_config["export"].items():
+            location = section_config["location"]
+            location_prefix = location + os.sep
+            archive_prefix = f"export/{name}/"
+            add_folder_entry(zip_file, archive_prefix)
+            for entry, _ in _scan_entries(location, section_config["entries"]):
+                log(f'Exporting "{entry}"...')
+                add_to_archive(
+                    zip_file, location_prefix + entry, archive_prefix + entry
+                )
 
-    shutil.copy(CONFIG_FILE, export_path)
+    log(f"Successfully exported to {export_path}{EXPORT_EXTENSION}")
 
-    log("Creating archive")
-    shutil.make_archive(export_path, "zip", export_path)
 
-    shutil.rmtree(export_path)
-    shutil.move(export_path + ".zip", export_path + EXPORT_EXTENSION)
+def add_folder_entry(zip_file, arcname):
+    """Adds an empty folder to an open zip archive.
 
-    log(f"Successfully exported to {export_path}{EXPORT_EXTENSION}")
+    Args:
+        zip_file: the ZipFile opened for writing
+        arcname: name of the folder inside the archive
+    """
+    info = ZipInfo(arcname.rstrip("/") + "/", date_time=datetime.now().timetuple()[:6])
+    # same attributes zipfile gives folders added with ZipFile.write
+    info.external_attr = 0o40775 << 16 | 0x10
+    zip_file.writestr(info, b"")
+
+
+def add_to_archive(zip_file, path, arcname):
+    """Adds a file, or a folder with everything inside it, to an open zip archive.
+    Files that are already compressed are stored as they are instead of being
+    deflated again. Symlinks are followed and dangling ones are skipped.
+
+    Args:
+        zip_file: the ZipFile opened for writing
+        path: path to the file/folder to add
+        arcname: name of the file/folder inside the archive
+    """
+
+    def add_file(path, arcname):
+        compress_type = (
+            ZIP_STORED
+            if os.path.splitext(path)[1].lower() in _COMPRESSED_SUFFIXES
+            else ZIP_DEFLATED
+        )
+        zip_file.write(path, arcname, compress_type=compress_type)
+
+    if not os.path.isdir(path):
+        add_file(path, arcname)
+        return
+
+    zip_file.write(path, arcname)
+    for dirpath, dirnames, filenames in os.walk(path, followlinks=True):
+        dirpath_prefix = dirpath + os.sep
+        relpath = os.path.relpath(dirpath, path)
+        archive_prefix = f"{arcname}/" if relpath == "." else f"{arcname}/{relpath}/"
+        dirnames.sort()
+        for name in dirnames:
+            zip_file.write(dirpath_prefix + name, archive_prefix + name)
+        for name in sorted(filenames):
+            file_path = dirpath_prefix + name
+            if os.path.exists(file_path):
+                add_file(file_path, archive_prefix + name)
 
 
 @exception_handler
@@ -411,36 +647,109 @@ def import_profile(path):
     log("Importing profile. It might take a minute or two...")
 
     item = os.path.basename(path).replace(EXPORT_EXTENSION, "")
+    profile_dir = os.path.join(PROFILES_DIR, item)
+    config_file_location = os.path.join(profile_dir, "conf.yaml")
 
-    temp_path = os.path.join(KONSAVE_DIR, "temp", item)
-
+    # every file is extracted straight to where it belongs instead of extracting the
+    # whole archive to a temporary folder and copying it from there
     with ZipFile(path, "r") as zip_file:
-        zip_file.extractall(temp_path)
+        # conf.yaml says where the exported files go, so it's read before anything is
+        # written and every member is checked before the profile is created
+        config_data = zip_file.read("conf.yaml")
+        with TemporaryDirectory() as temp_dir:
+            temp_config = os.path.join(temp_dir, "conf.yaml")
+            with open(temp_config, "wb") as file:
+                file.write(config_data)
+            konsave_config = read_konsave_config(temp_config)
+        assert konsave_config is not None, "Not a valid konsave file"
+
+        members = []
+        for info in zip_file.infolist():
+            member = _member_destination(
+                info.filename, profile_dir, konsave_config["export"]
+            )
+            if member is not None:
+                members.append((info, *member))
 
-    config_file_location = os.path.join(temp_path, "conf.yaml")
-    konsave_config = read_konsave_config(config_file_location)
+        mkdir(profile_dir)
+        try:
+            with open(config_file_location, "wb") as file:
+                file.write(config_data)
+
+            imported = set()
+            for info, entry, dest in members:
+                if entry is not None and entry not in imported:
+                    imported.add(entry)
+                    log(f'Importing "{entry[1]}"...')
+                _extract_member(zip_file, info, dest)
+        except BaseException:
+            # don't leave a half imported profile behind
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
 
-    profile_dir = os.path.join(PROFILES_DIR, item)
-    copy(os.path.join(temp_path, "save"), profile_dir)
-    shutil.copy(os.path.join(temp_path, "conf.yaml"), profile_dir)
-
-    for section in konsave_config["export"]:
-        location = konsave_config["export"][section]["location"]
-        path = os.path.join(temp_path, "export", section)
-        mkdir(path)
-        for entry in konsave_config["export"][section]["entries"]:
-            source = os.path.join(path, entry)
-            dest = os.path.join(location, entry)
-            log(f'Importing "{entry}"...')
-            if os.path.exists(source):
-                if os.path.isdir(source):
-                    copy(source, dest)
-                else:
-                    shutil.copy(source, dest)
+    log("Profile successfully imported!")
 
-    shutil.rmtree(temp_path)
 
-    log("Profile successfully imported!")
+def _member_destination(filename, profile_dir, export_config):
+    """Works out where a member of an exported profile has to be extracted to.
+
+    Args:
+        filename: name of the member in the archive
+        profile_dir: folder of the profile being imported
+        export_config: the "export" part of the archived konsave config
+
+    Returns:
+        None if the member isn't imported, otherwise (entry, dest) where entry is
+        the (section, entry) the member belongs to or None for saved files.
+    """
+    # don't let crafted member names escape the folder they are extracted to.
+    # symlinks already on disk are followed like the export followed them, since
+    # extracting never creates any
+    parts = filename.rstrip("/").split("/")
+    assert not filename.startswith("/") and not {"", ".", ".."} & set(parts), (
+        f'Refusing to import "{filename}": absolute paths and empty, "." or ".." '
+        "path components aren't allowed"
+    )
+
+    if parts[0] == "save":
+        entry, location, name = None, profile_dir, parts[1:]
+    elif parts[0] == "export" and len(parts) > 2 and parts[1] in export_config:
+        section_config = export_config[parts[1]]
+        location, name = section_config["location"], parts[2:]
+        member = "/".join(name)
+        entry = next(
+            (
+                (parts[1], listed)
+                for listed in section_config["entries"]
+                if member == listed or member.startswith(listed + "/")
+            ),
+            None,
+        )
+        if entry is None:
+            return None
+    else:
+        return None
+
+    if not name:
+        return None
+    return entry, os.path.join(location, *name)
+
+
+def _extract_member(zip_file, info, dest):
+    """Extracts a single file/folder of an open zip archive to "dest".
+
+    Args:
+        zip_file: the ZipFile opened for reading
+        info: the ZipInfo of the member to extract
+        dest: path to extract the member to
+    """
+    if info.is_dir():
+        mkdir(dest)
+        return
+
+    mkdir(os.path.dirname(dest))
+    with zip_file.open(info) as source, open(dest, "wb") as file:
+        shutil.copyfileobj(source, file, 1 << 20)
 
 
 @exception_handler
@@ -3,39 +3,91 @@ This module parses conf.yaml
 """
 import os
 import re
+from functools import lru_cache
+from typing import Optional, Pattern
 from konsave.consts import HOME, CONFIG_DIR, SHARE_DIR, BIN_DIR
 
 
-def ends_with(grouped_regex, path) -> str:
+@lru_cache(maxsize=256)
+def _find_entry(path, matches, text):
+    """Finds the first entry of a folder whose name matches the text. The folder is
+    scanned lazily and the scan stops at the first match.
+
+    Args:
+        path: path to the folder
+        matches: str.startswith or str.endswith
+        text: the text the name should begin or end with
+
+    Returns:
+        the name of the entry, None if there is none or the folder doesn't exist
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if matches(entry.name, text):
+                    return entry.name
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return None
+
+
+def ends_with(text, parent) -> Optional[str]:
     """Finds folder with name ending with the provided string.
 
     Args:
-        grouped_regex: regex of the function
-        path: path
+        text: the text the name should end with
+        parent: path to the folder to look in
+
+    Returns:
+        the name of the folder, None if there is none
     """
-    occurence = re.search(grouped_regex, path).group()
-    dirs = os.listdir(path[0 : path.find(occurence)])
-    ends_with_text = re.search(grouped_regex, occurence).group(2)
-    for directory in dirs:
-        if directory.endswith(ends_with_text):
-            return path.replace(occurence, directory)
-    return occurence
+    return _find_entry(parent, str.endswith, text)
 
 
-def begins_with(grouped_regex, path) -> str:
+def begins_with(text, parent) -> Optional[str]:
     """Finds folder with name beginning with the provided string.
 
     Args:
-        grouped_regex: regex of the function
+        text: the text the name should begin with
+        parent: path to the folder to look in
+
+    Returns:
+        the name of the folder, None if there is none
+    """
+    return _find_entry(parent, str.startswith, text)
+
+
+def resolve_functions(grouped_regex: Pattern, functions, path) -> str:
+    """Replaces every function in a path in a single scan of it. Each function is
+    resolved in the folder the path leads to up to that function. Functions that
+    can't be resolved are left as they are.
+
+    Args:
+        grouped_regex: compiled regex of the functions
+        functions: maps function names to the functions
         path: path
     """
-    occurence = re.search(grouped_regex, path).group()
-    dirs = os.listdir(path[0 : path.find(occurence)])
-    ends_with_text = re.search(grouped_regex, occurence).group(2)
-    for directory in dirs:
-        if directory.startswith(ends_with_text):
-            return path.replace(occurence, directory)
-    return occurence
+    resolved = []
+    last = 0
+    for match in grouped_regex.finditer(path):
+        resolved.append(path[last : match.start()])
+        func = functions.get(match.group(1))
+        name = func(match.group(2), "".join(resolved)) if func else None
+        resolved.append(match.group() if name is None else name)
+        last = match.end()
+    resolved.append(path[last:])
+    return "".join(resolved)
+
+
+@lru_cache(maxsize=None)
+def _compile_function_regex(token_symbol, grouped_regex):
+    """Compiles the grouped function regex once per token symbol.
+
+    Args:
+        token_symbol: TOKEN_SYMBOL
+        grouped_regex: regex capturing the function name and its argument
+    """
+    return re.compile(f"\\{token_symbol}{grouped_regex}")
 
 
 def parse_keywords(tokens_, token_symbol, parsed):
@@ -47,13 +99,15 @@ def parse_keywords(tokens_, token_symbol, parsed):
         token_symbol: TOKEN_SYMBOL
         parsed: the parsed conf.yaml file
     """
-    for item in parsed:
-        for name in parsed[item]:
+    for item in parsed.values():
+        for entry in item.values():
+            location = entry["location"]
+            # most locations are plain paths without any token in them
+            if token_symbol not in location:
+                continue
             for key, value in tokens_["keywords"]["dict"].items():
-                word = token_symbol + key
-                location = parsed[item][name]["location"]
-                if word in location:
-                    parsed[item][name]["location"] = location.replace(word, value)
+                location = location.replace(token_symbol + key, value)
+            entry["location"] = location
 
 
 def parse_functions(tokens_, token_symbol, parsed):
@@ -66,21 +120,16 @@ def parse_functions(tokens_, token_symbol, parsed):
         parsed: the parsed conf.yaml file
     """
     functions = tokens_["functions"]
-    raw_regex = f"\\{token_symbol}{functions['raw_regex']}"
-    grouped_regex = f"\\{token_symbol}{functions['grouped_regex']}"
-
-    for item in parsed:
-        for name in parsed[item]:
-            location = parsed[item][name]["location"]
-            occurences = re.findall(raw_regex, location)
-            if not occurences:
+    grouped_regex = _compile_function_regex(token_symbol, functions["grouped_regex"])
+
+    for item in parsed.values():
+        for entry in item.values():
+            location = entry["location"]
+            if token_symbol not in location:
                 continue
-            for occurence in occurences:
-                func = re.search(grouped_regex, occurence).group(1)
-                if func in functions["dict"]:
-                    parsed[item][name]["location"] = functions["dict"][func](
-                        grouped_regex, location
-                    )
+            entry["location"] = resolve_functions(
+                grouped_regex, functions["dict"], location
+            )
 
 
 TOKEN_SYMBOL = "$"
@@ -94,8 +143,7 @@ tokens = {
         }
     },
     "functions": {
-        "raw_regex": r"\{\w+\=(?:\"|')\S+(?:\"|')\}",
-        "grouped_regex": r"\{(\w+)\=(?:\"|')(\S+)(?:\"|')\}",
+        "grouped_regex": r"\{(\w+)\=(?:\"|')([^\"']+)(?:\"|')\}",
         "dict": {"ENDS_WITH": ends_with, "BEGINS_WITH": begins_with},
     },
 }
@@ -46,7 +46,7 @@ setup(
     packages=find_packages(),
     package_data={"config": ["conf.yaml"]},
     include_package_data=True,
-    python_requires=">=3.6",
+    python_requires=">=3.8",
     install_requires=_REQUIREMENTS,
     extras_require={"dev": _REQUIREMENTS_DEV},
     classifiers=[